@@ -13,8 +13,16 @@ Terminal Gobang - Human vs AI Five-in-a-Row Game
 """
 
 import os
-import random
+import queue
+import re
+import sys
+import threading
 import time
+from functools import lru_cache
+
+import numpy as np
+from numba import njit
+from numpy.lib.stride_tricks import sliding_window_view
 
 # ==================== 常量定义 ====================
 BOARD_SIZE = 15  # 棋盘尺寸
@@ -22,6 +30,31 @@ EMPTY = 0        # 空位
 BLACK = 1        # 黑棋
 WHITE = 2        # 白棋
 
+# 打包后的可执行文件没有源码目录可写，不能使用 Numba 的磁盘缓存
+NJIT_CACHE = not getattr(sys, 'frozen', False)
+
+# Zobrist 哈希：每个 (行, 列, 棋子颜色) 对应一个固定的 64 位随机数
+ZOBRIST = np.random.SeedSequence(42).generate_state(
+    BOARD_SIZE * BOARD_SIZE * 2, dtype=np.uint64
+).reshape(BOARD_SIZE, BOARD_SIZE, 2)
+
+SCORE_CACHE_SIZE = 4096  # 整盘评分缓存的最大局面数
+
+# AI 搜索参数
+AI_MIN_DEPTH = 2      # 迭代加深的起始深度
+AI_MAX_DEPTH = 4      # 迭代加深的最大深度
+AI_BRANCH_LIMIT = 10  # 每层只展开静态评分最高的若干候选点
+AI_TIME_LIMIT = 1.0   # 用时超过该值（秒）后不再加深搜索
+MIN_AI_THINK = 0.25   # AI 每步的最短思考时间（秒）
+SPINNER = "|/-\\"      # AI 思考时的动画帧
+SPINNER_INTERVAL = 0.1  # 动画刷新间隔（秒）
+WIN_SCORE = 10000000  # 必胜局面的估值
+
+# 置换表表项类型
+TT_EXACT = 0  # 精确值
+TT_LOWER = 1  # 下界（发生了 β 剪枝）
+TT_UPPER = 2  # 上界（所有走法都不超过 α）
+
 # 棋子显示符号
 SYMBOLS = {
     EMPTY: ' + ',
@@ -29,20 +62,40 @@ SYMBOLS = {
     WHITE: ' ○ '
 }
 
+# 坐标输入格式: 字母+数字 或 数字+字母，中间可以有空格
+_COORD_RE = re.compile(r'^\s*([A-O])\s*(\d{1,2})\s*$|^\s*(\d{1,2})\s*([A-O])\s*$', re.I)
+
+# 界面与棋盘渲染用的静态字符串
+_BANNER = "=" * 60
+_RULE = "-" * 60
+_TITLE = f"\n{_BANNER}\n          ASCII字符五子棋 - 人机对战 v2.0\n{_BANNER}\n"
+_COL_HEADER = "    " + "".join(f" {chr(ord('A') + i)}  " for i in range(BOARD_SIZE)) + "\n"
+_HR = "  " + "─" * (BOARD_SIZE * 4 + 1) + "\n"
+
 # ==================== 全局变量 ====================
-board = []           # 棋盘数据
+board = np.zeros((BOARD_SIZE, BOARD_SIZE), dtype=np.uint8)  # 棋盘数据
 history = []         # 落子历史（用于悔棋）
 game_over = False    # 游戏结束标志
 current_player = BLACK  # 当前玩家
 ai_enabled = True    # 是否启用AI
 thinking = False     # AI思考状态标志
+cand_refcount = np.zeros((BOARD_SIZE, BOARD_SIZE), dtype=np.int16)  # 每个格子周围2格内的棋子数（候选点引用计数）
+candidates_set = set()  # 候选落子点（已有棋子周围2格范围内的空位）
+board_hash = 0       # 当前局面的 Zobrist 哈希值
+black_bb = 0         # 黑棋位棋盘：第 row * BOARD_SIZE + col 位表示 (row, col)
+white_bb = 0         # 白棋位棋盘
+transposition_table = {}  # 置换表：局面哈希 -> (深度, 估值, 类型, 最佳落子)
 
 # ==================== 初始化函数 ====================
 def init_board():
-    """初始化棋盘"""
-    global board, history, game_over, current_player
-    board = [[EMPTY for _ in range(BOARD_SIZE)] for _ in range(BOARD_SIZE)]
-    history = []
+    """初始化棋盘（原地清空，跨局复用同一块棋盘内存）"""
+    global game_over, current_player, board_hash, black_bb, white_bb
+    board.fill(EMPTY)
+    history.clear()
+    rebuild_candidates()
+    board_hash = 0
+    black_bb = white_bb = 0
+    transposition_table.clear()
     game_over = False
     current_player = BLACK
 
@@ -55,38 +108,37 @@ def render_board():
     """渲染并显示棋盘"""
     clear_screen()
     
-    print("\n" + "=" * 60)
-    print("          ASCII字符五子棋 - 人机对战 v2.0")
-    print("=" * 60)
+    # 整帧内容先拼接到缓冲区，最后一次性输出
+    parts = []
+    parts.append(_TITLE)
     
     # 显示模式信息
     mode_str = "人机对战" if ai_enabled else "双人对战"
-    print(f"  模式: {mode_str} | 当前回合: {'黑棋 ●' if current_player == BLACK else '白棋 ○'}")
-    print("-" * 60)
+    parts.append(f"  模式: {mode_str} | 当前回合: {'黑棋 ●' if current_player == BLACK else '白棋 ○'}\n")
+    parts.append(_RULE + "\n")
     
-    # 打印列坐标 (A-O)
-    print("    ", end="")
-    for i in range(BOARD_SIZE):
-        col_letter = chr(ord('A') + i)
-        print(f" {col_letter}  ", end="")
-    print()
+    # 列坐标 (A-O)
+    parts.append(_COL_HEADER)
     
-    # 打印棋盘主体
-    print("  " + "─" * (BOARD_SIZE * 4 + 1))
+    # 棋盘主体
+    parts.append(_HR)
     
-    for row in range(BOARD_SIZE):
+    for row, cells in enumerate(board.tolist()):
         # 行号
         row_num = str(row + 1).rjust(2)
-        print(f"{row_num} │", end="")
+        parts.append(f"{row_num} │")
         
-        for col in range(BOARD_SIZE):
-            print(f"{SYMBOLS[board[row][col]]}│", end="")
-        print()
+        for cell in cells:
+            parts.append(f"{SYMBOLS[cell]}│")
+        parts.append("\n")
         
         # 分隔线
-        print("  " + "─" * (BOARD_SIZE * 4 + 1))
+        parts.append(_HR)
+    
+    parts.append("\n说明: 输入坐标落子(如 H8)，输入 undo 悔棋，restart 重新开始，quit 退出\n")
     
-    print("\n说明: 输入坐标落子(如 H8)，输入 undo 悔棋，restart 重新开始，quit 退出")
+    sys.stdout.write("".join(parts))
+    sys.stdout.flush()
 
 # ==================== 坐标处理函数 ====================
 def parse_coordinate(input_str):
@@ -95,29 +147,15 @@ def parse_coordinate(input_str):
     支持格式: H8, 8H, H 8, 8 H (不区分大小写)
     返回: (row, col) 从0开始索引，失败返回 None
     """
-    input_str = input_str.strip().upper().replace(" ", "")
-    
-    if len(input_str) < 2:
+    m = _COORD_RE.match(input_str)
+    if not m:
         return None
     
-    # 提取字母和数字
-    letters = ""
-    numbers = ""
-    
-    for char in input_str:
-        if char.isalpha():
-            letters += char
-        elif char.isdigit():
-            numbers += char
+    letters = (m.group(1) or m.group(4)).upper()
+    numbers = m.group(2) or m.group(3)
     
-    if not letters or not numbers:
-        return None
-    
-    try:
-        col = ord(letters[0]) - ord('A')
-        row = int(numbers) - 1
-    except (ValueError, IndexError):
-        return None
+    col = ord(letters) - ord('A')
+    row = int(numbers) - 1
     
     # 验证坐标范围
     if 0 <= row < BOARD_SIZE and 0 <= col < BOARD_SIZE:
@@ -129,184 +167,435 @@ def is_valid_move(row, col):
     """检查落子是否合法"""
     if not (0 <= row < BOARD_SIZE and 0 <= col < BOARD_SIZE):
         return False
-    return board[row][col] == EMPTY
+    return board[row, col] == EMPTY
 
 # ==================== 落子函数 ====================
+def rebuild_candidates():
+    """根据当前棋盘一次性重建候选点引用计数和候选集合"""
+    # 每个格子的引用计数 = 以它为中心的 5x5 窗口内的棋子数
+    occupied = np.pad(board != EMPTY, 2).astype(np.int16)
+    cand_refcount[:] = sliding_window_view(occupied, (5, 5)).sum(axis=(2, 3))
+    
+    candidates_set.clear()
+    mask = (cand_refcount > 0) & (board == EMPTY)
+    candidates_set.update(map(tuple, np.argwhere(mask).tolist()))
+
 def make_move(row, col, player):
     """执行落子"""
-    board[row][col] = player
+    global board_hash, black_bb, white_bb
+    board[row, col] = player
     history.append((row, col, player))
+    board_hash ^= int(ZOBRIST[row, col, player - 1])
+    if player == BLACK:
+        black_bb |= 1 << (row * BOARD_SIZE + col)
+    else:
+        white_bb |= 1 << (row * BOARD_SIZE + col)
+    
+    # 增量维护候选点：周围2格内的引用计数加一
+    for nr in range(max(0, row - 2), min(BOARD_SIZE, row + 3)):
+        for nc in range(max(0, col - 2), min(BOARD_SIZE, col + 3)):
+            cand_refcount[nr, nc] += 1
+            if cand_refcount[nr, nc] == 1 and board[nr, nc] == EMPTY:
+                candidates_set.add((nr, nc))
+    candidates_set.discard((row, col))
+    
     return check_win(row, col, player)
 
 def undo_move():
     """悔棋一步"""
+    global board_hash, black_bb, white_bb
     if history:
         row, col, player = history.pop()
-        board[row][col] = EMPTY
+        board[row, col] = EMPTY
+        board_hash ^= int(ZOBRIST[row, col, player - 1])
+        if player == BLACK:
+            black_bb &= ~(1 << (row * BOARD_SIZE + col))
+        else:
+            white_bb &= ~(1 << (row * BOARD_SIZE + col))
+        
+        # 增量维护候选点：周围2格内的引用计数减一
+        for nr in range(max(0, row - 2), min(BOARD_SIZE, row + 3)):
+            for nc in range(max(0, col - 2), min(BOARD_SIZE, col + 3)):
+                cand_refcount[nr, nc] -= 1
+                if cand_refcount[nr, nc] == 0:
+                    candidates_set.discard((nr, nc))
+        if cand_refcount[row, col] > 0:
+            candidates_set.add((row, col))
+        
         return True
     return False
 
+# ==================== 预计算表 ====================
+# 四个方向：横向，纵向，右斜(\)，左斜
+DIRECTIONS = np.array([(0, 1), (1, 0), (1, 1), (1, -1)], dtype=np.int64)
+
+def _build_max_steps():
+    """
+    预计算每个格子沿每个方向最多能走几步仍在棋盘内。
+    MAX_STEPS[row, col, d, 0] 为正方向步数，MAX_STEPS[row, col, d, 1] 为反方向步数。
+    """
+    max_steps = np.zeros((BOARD_SIZE, BOARD_SIZE, len(DIRECTIONS), 2), dtype=np.int8)
+    for row in range(BOARD_SIZE):
+        for col in range(BOARD_SIZE):
+            for d, (dr, dc) in enumerate(DIRECTIONS.tolist()):
+                for k, sign in enumerate((1, -1)):
+                    steps = 0
+                    r, c = row + sign * dr, col + sign * dc
+                    while 0 <= r < BOARD_SIZE and 0 <= c < BOARD_SIZE:
+                        steps += 1
+                        r += sign * dr
+                        c += sign * dc
+                    max_steps[row, col, d, k] = steps
+    return max_steps
+
+MAX_STEPS = _build_max_steps()
+
+def _build_lines5():
+    """
+    预计算位棋盘上所有连五的掩码。
+    LINES5[(row, col)] 为经过 (row, col) 的全部五连掩码。
+    """
+    lines5 = {(row, col): [] for row in range(BOARD_SIZE) for col in range(BOARD_SIZE)}
+    for dr, dc in DIRECTIONS.tolist():
+        for row in range(BOARD_SIZE):
+            for col in range(BOARD_SIZE):
+                cells = [(row + k * dr, col + k * dc) for k in range(5)]
+                if not all(0 <= r < BOARD_SIZE and 0 <= c < BOARD_SIZE for r, c in cells):
+                    continue
+                mask = 0
+                for r, c in cells:
+                    mask |= 1 << (r * BOARD_SIZE + c)
+                for cell in cells:
+                    lines5[cell].append(mask)
+    return lines5
+
+LINES5 = _build_lines5()
+
+# 棋型查找表：每个方向取以落子点为中心的 9 个格子，每格 2 位编码成 18 位的键
+WINDOW_RADIUS = 4    # 落子点两侧各取 4 格
+OFF_BOARD = 3        # 棋盘外格子的编码
+
+def _build_pattern_lut():
+    """
+    预计算棋型查找表 PATTERN_LUT[player - 1, key]。
+    键的第 2*(k+4) 位起的两位是偏移 k (-4..4) 处格子的值，
+    得分规则与原先逐格统计连子数和开放端的逻辑完全一致。
+    """
+    keys = np.arange(1 << (2 * (2 * WINDOW_RADIUS + 1)), dtype=np.int64)
+    cells = [(keys >> (2 * i)) & 3 for i in range(2 * WINDOW_RADIUS + 1)]
+    center = cells[WINDOW_RADIUS]
+    
+    lut = np.zeros((2, len(keys)), dtype=np.int32)
+    for player in (BLACK, WHITE):
+        count = np.ones(len(keys), dtype=np.int64)      # 连子数
+        open_ends = np.zeros(len(keys), dtype=np.int64)  # 两端是否为空位
+        for sign in (1, -1):
+            alive = np.ones(len(keys), dtype=bool)
+            for k in range(1, WINDOW_RADIUS + 1):
+                cell = cells[WINDOW_RADIUS + sign * k]
+                # 连子后的第一个格子为空则该端开放
+                open_ends += alive & (cell == EMPTY)
+                alive &= cell == player
+                count += alive
+        
+        # 评分标准 (分值经过调优)
+        lut[player - 1] = np.select(
+            [
+                count >= 5,                          # 连五 (必胜/必防)
+                (count == 4) & (open_ends == 2),     # 活四 (必胜)
+                (count == 4) & (open_ends == 1),     # 冲四 (高威胁)
+                (count == 3) & (open_ends == 2),     # 活三 (进攻潜力)
+                (count == 3) & (open_ends == 1),     # 眠三
+                (count == 2) & (open_ends == 2),     # 活二
+                (count == 2) & (open_ends == 1),     # 眠二
+            ],
+            [200000, 20000, 5000, 1000, 100, 100, 10],
+            default=0,
+        )
+        # 中心格必须是该玩家的棋子
+        lut[player - 1, center != player] = 0
+    return lut
+
+PATTERN_LUT = _build_pattern_lut()
+
+def _build_symmetries():
+    """
+    预计算棋盘 D4 对称群的 8 个变换（4 种旋转和 4 种翻转）。
+    SYMMETRIES[t][row * BOARD_SIZE + col] 为格子经变换 t 后的编号，t = 0 为恒等变换。
+    """
+    n = BOARD_SIZE - 1
+    transforms = [
+        lambda r, c: (r, c),
+        lambda r, c: (c, n - r),
+        lambda r, c: (n - r, n - c),
+        lambda r, c: (n - c, r),
+        lambda r, c: (r, n - c),
+        lambda r, c: (n - r, c),
+        lambda r, c: (c, r),
+        lambda r, c: (n - c, n - r),
+    ]
+    symmetries = []
+    for transform in transforms:
+        table = []
+        for row in range(BOARD_SIZE):
+            for col in range(BOARD_SIZE):
+                r, c = transform(row, col)
+                table.append(r * BOARD_SIZE + c)
+        symmetries.append(table)
+    return symmetries
+
+SYMMETRIES = _build_symmetries()
+
 # ==================== 胜负判定函数 ====================
 def check_win(row, col, player):
     """检查是否获胜"""
-    directions = [
-        (0, 1),   # 横向
-        (1, 0),   # 纵向
-        (1, 1),   # 右斜
-        (1, -1)   # 左斜
-    ]
+    bb = black_bb if player == BLACK else white_bb
+    return any(bb & mask == mask for mask in LINES5[(row, col)])
+
+# ==================== 增强版 AI 系统 ====================
+@njit(cache=NJIT_CACHE, nogil=True)
+def _eval_point_nb(board, row, col, player, lut):
+    """
+    evaluate_point_score 的 Numba 内核：board 为 uint8 二维数组，lut 为 PATTERN_LUT。
+    查找表作为参数传入（大数组做全局常量会让 Numba 无法缓存编译结果）。
+    """
+    score = 0
     
-    for dr, dc in directions:
-        count = 1
-        
-        # 正方向检查
-        r, c = row + dr, col + dc
-        while 0 <= r < BOARD_SIZE and 0 <= c < BOARD_SIZE and board[r][c] == player:
-            count += 1
-            r += dr
-            c += dc
+    for d in range(len(DIRECTIONS)):
+        dr, dc = DIRECTIONS[d, 0], DIRECTIONS[d, 1]
         
-        # 反方向检查
-        r, c = row - dr, col - dc
-        while 0 <= r < BOARD_SIZE and 0 <= c < BOARD_SIZE and board[r][c] == player:
-            count += 1
-            r -= dr
-            c -= dc
+        # 把该方向上的 9 个格子编码成查找表的键，棋盘外的格子记为 OFF_BOARD。
+        # 落子点本身直接按 player 的棋子编码，不需要临时改写棋盘。
+        key = player << (2 * WINDOW_RADIUS)
+        for k in range(1, WINDOW_RADIUS + 1):
+            # 正方向
+            cell = board[row + k * dr, col + k * dc] if k <= MAX_STEPS[row, col, d, 0] else OFF_BOARD
+            key |= cell << (2 * (WINDOW_RADIUS + k))
+            # 反方向
+            cell = board[row - k * dr, col - k * dc] if k <= MAX_STEPS[row, col, d, 1] else OFF_BOARD
+            key |= cell << (2 * (WINDOW_RADIUS - k))
         
-        if count >= 5:
-            return True
+        score += lut[player - 1, key]
     
-    return False
+    return score
+
+@njit(cache=NJIT_CACHE, nogil=True)
+def _score_candidates_nb(board, refcount, lut):
+    """
+    一次性计算双方在所有候选点（refcount > 0 的空位）落子的单点评分。
+    返回 (2, BOARD_SIZE, BOARD_SIZE) 数组，第一维为 player - 1，非候选点为 0。
+    """
+    scores = np.zeros((2, BOARD_SIZE, BOARD_SIZE), dtype=np.int64)
+    for row in range(BOARD_SIZE):
+        for col in range(BOARD_SIZE):
+            if board[row, col] == EMPTY and refcount[row, col] > 0:
+                scores[0, row, col] = _eval_point_nb(board, row, col, BLACK, lut)
+                scores[1, row, col] = _eval_point_nb(board, row, col, WHITE, lut)
+    return scores
+
+def score_all_points():
+    """返回当前局面下双方在所有候选点的单点评分表 scores[player - 1][row][col]"""
+    return _score_all_cached(board_hash)
+
+@lru_cache(maxsize=SCORE_CACHE_SIZE)
+def _score_all_cached(position_hash):
+    """按局面哈希缓存整盘评分，position_hash 只用作缓存键"""
+    return _score_candidates_nb(board, cand_refcount, PATTERN_LUT).tolist()
 
-# ==================== 增强版 AI 系统 ====================
 def evaluate_point_score(row, col, player):
     """
-    评估在 (row, col) 落子对特定玩家的得分。
+    评估在候选点 (row, col) 落子对特定玩家的得分。
     只计算涉及该落子点的横、竖、斜四个方向。
     """
-    score = 0
-    # 临时落子以模拟棋型
-    board[row][col] = player
-    
-    # 四个方向：横向，纵向，右斜(\)，左斜
-    directions = [(1, 0), (0, 1), (1, 1), (1, -1)]
-    
-    for dr, dc in directions:
-        count = 1  # 连子数
-        open_ends = 0  # 两端是否为空位
-        
-        # 正方向搜索
-        r, c = row + dr, col + dc
-        while 0 <= r < BOARD_SIZE and 0 <= c < BOARD_SIZE and board[r][c] == player:
-            count += 1
-            r += dr
-            c += dc
-        # 检查正方向末端是否为空
-        if 0 <= r < BOARD_SIZE and 0 <= c < BOARD_SIZE and board[r][c] == EMPTY:
-            open_ends += 1
-            
-        # 反方向搜索
-        r, c = row - dr, col - dc
-        while 0 <= r < BOARD_SIZE and 0 <= c < BOARD_SIZE and board[r][c] == player:
-            count += 1
-            r -= dr
-            c -= dc
-        # 检查反方向末端是否为空
-        if 0 <= r < BOARD_SIZE and 0 <= c < BOARD_SIZE and board[r][c] == EMPTY:
-            open_ends += 1
-            
-        # 评分标准 (分值经过调优)
-        if count >= 5:
-            score += 200000   # 连五 (必胜/必防)
-        elif count == 4:
-            if open_ends == 2:
-                score += 20000    # 活四 (必胜)
-            elif open_ends == 1:
-                score += 5000     # 冲四 (高威胁)
-        elif count == 3:
-            if open_ends == 2:
-                score += 1000     # 活三 (进攻潜力)
-            elif open_ends == 1:
-                score += 100      # 眠三
-        elif count == 2:
-            if open_ends == 2:
-                score += 100      # 活二
-            elif open_ends == 1:
-                score += 10       # 眠二
-                
-    # 撤销模拟落子
-    board[row][col] = EMPTY
-    return score
+    return score_all_points()[player - 1][row][col]
+
+# 预热 JIT，避免 AI 第一次落子时才触发编译
+_score_candidates_nb(
+    np.zeros((BOARD_SIZE, BOARD_SIZE), dtype=np.uint8),
+    np.ones((BOARD_SIZE, BOARD_SIZE), dtype=np.int16),
+    PATTERN_LUT,
+)
 
 def get_candidate_positions():
     """获取候选位置（已有棋子周围2格范围内的空位，提高搜索效率）"""
-    candidates = set()
     # 如果是第一手，直接返回中心点
     if not history:
         return [(7, 7)]
+    
+    # 候选集合由 make_move / undo_move 增量维护
+    return list(candidates_set)
+
+def score_move(row, col, player):
+    """
+    按贪心规则为 player 在 (row, col) 的落子打分，用于搜索中的走法排序。
+    返回: (综合得分, 进攻分, 防守分)
+    """
+    opponent = WHITE if player == BLACK else BLACK
+    
+    # 1. 进攻分：如果自己下这里
+    attack_score = evaluate_point_score(row, col, player)
+    
+    # 2. 防守分：如果对手下这里
+    defend_score = evaluate_point_score(row, col, opponent)
+    
+    # 综合得分逻辑
+    score = attack_score + defend_score
+    
+    # --- 决策优先级调整 ---
+    
+    # 1. 如果对手有活四（defend_score >= 20000），这是致命威胁，
+    #    必须阻挡！给一个巨大的加分，确保它比普通进攻优先级高。
+    if defend_score >= 20000:
+        score += 100000 
         
-    for row in range(BOARD_SIZE):
-        for col in range(BOARD_SIZE):
-            if board[row][col] != EMPTY:
-                # 检查周围2格范围
-                for dr in range(-2, 3):
-                    for dc in range(-2, 3):
-                        if dr == 0 and dc == 0:
-                            continue
-                        nr, nc = row + dr, col + dc
-                        if 0 <= nr < BOARD_SIZE and 0 <= nc < BOARD_SIZE and board[nr][nc] == EMPTY:
-                            candidates.add((nr, nc))
-    
-    return list(candidates)
+    # 2. 如果对手有冲四（defend_score >= 5000），威胁也很高，
+    #    适当提高防守优先级。
+    elif defend_score >= 5000:
+        score += 2000
+    
+    # --- 其他策略 ---
+    # 如果这一步既能防守又能形成活三/活四，分数会自然叠加
+    
+    # 增加一点位置权重，让AI倾向于走中间（避免在边缘落子）
+    dist_from_center = abs(row - 7) + abs(col - 7)
+    score += max(0, (14 - dist_from_center))
+    
+    return score, attack_score, defend_score
 
-def get_ai_move():
-    """AI获取最佳落子位置"""
+def order_moves(player, allowed=None):
+    """
+    对 player 的所有候选点按 score_move 从高到低排序。
+    allowed 不为 None 时只考虑其中的落子点。
+    返回: [(综合得分, 进攻分, 防守分, (row, col)), ...]
+    """
     candidates = get_candidate_positions()
-    best_score = -1
-    best_move = None
+    if allowed is not None:
+        candidates = [move for move in candidates if move in allowed]
     
-    # 遍历所有候选点
-    for row, col in candidates:
-        # 1. 进攻分：如果AI下这里
-        attack_score = evaluate_point_score(row, col, WHITE)
-        
-        # 2. 防守分：如果玩家下这里
-        defend_score = evaluate_point_score(row, col, BLACK)
-        
-        # 综合得分逻辑
-        score = attack_score + defend_score
-        
-        # --- 决策优先级调整 ---
-        
-        # 1. 如果AI这一步能连五，直接下，分数最高
+    # 随机因子一次性生成，避免在循环内逐个调用随机数
+    jitter = np.random.randint(0, 6, size=len(candidates))
+    
+    moves = []
+    for i, (row, col) in enumerate(candidates):
+        score, attack_score, defend_score = score_move(row, col, player)
+        # 加入微小的随机因子，避免AI每次走法完全一致
+        moves.append((score + int(jitter[i]), attack_score, defend_score, (row, col)))
+    
+    moves.sort(reverse=True)
+    return moves
+
+def negamax(depth, alpha, beta, player, allowed=None):
+    """
+    带 α-β 剪枝的负极大值搜索，返回当前局面对 player（轮到其落子）的估值。
+    allowed 不为 None 时本层只搜索其中的落子点（用于根节点的对称去重）。
+    搜索结果写入置换表，表项为 (深度, 估值, 类型, 最佳落子)。
+    """
+    alpha_orig = alpha
+    
+    # 查询置换表：深度足够时直接利用已有结果收窄窗口
+    tt_move = None
+    entry = transposition_table.get(board_hash)
+    if entry is not None:
+        tt_depth, tt_value, tt_flag, tt_move = entry
+        if tt_depth >= depth:
+            if tt_flag == TT_EXACT:
+                return tt_value
+            elif tt_flag == TT_LOWER:
+                alpha = max(alpha, tt_value)
+            elif tt_flag == TT_UPPER:
+                beta = min(beta, tt_value)
+            if alpha >= beta:
+                return tt_value
+    
+    moves = order_moves(player, allowed)
+    if not moves:
+        return 0  # 棋盘已满，和棋
+    
+    # 能直接连五则必胜，步数越少越好
+    for _, attack_score, _, move in moves:
         if attack_score >= 200000:
-            return (row, col)
-            
-        # 2. 如果玩家有活四（defend_score >= 20000），这是致命威胁，
-        #    必须阻挡！给一个巨大的加分，确保它比普通进攻优先级高。
-        if defend_score >= 20000:
-            score += 100000 
-            
-        # 3. 如果玩家有冲四（defend_score >= 5000），威胁也很高，
-        #    适当提高防守优先级。
-        elif defend_score >= 5000:
-            score += 2000
-        
-        # --- 其他策略 ---
-        # 如果这一步既能防守又能形成活三/活四，分数会自然叠加
+            transposition_table[board_hash] = (depth, WIN_SCORE + depth, TT_EXACT, move)
+            return WIN_SCORE + depth
+    
+    # 叶子节点：双方在所有候选点上的进攻分总和之差
+    if depth == 0:
+        return sum(m[1] for m in moves) - sum(m[2] for m in moves)
+    
+    # 置换表中的最佳落子优先搜索，其余按静态评分高低
+    moves = [m[3] for m in moves[:AI_BRANCH_LIMIT]]
+    if tt_move in moves:
+        moves.remove(tt_move)
+        moves.insert(0, tt_move)
+    
+    opponent = WHITE if player == BLACK else BLACK
+    best_value = -WIN_SCORE * 2
+    best_move = moves[0]
+    
+    for row, col in moves:
+        make_move(row, col, player)
+        value = -negamax(depth - 1, -beta, -alpha, opponent)
+        undo_move()
         
-        # 增加一点位置权重，让AI倾向于走中间（避免在边缘落子）
-        dist_from_center = abs(row - 7) + abs(col - 7)
-        score += max(0, (14 - dist_from_center))
+        if value > best_value:
+            best_value = value
+            best_move = (row, col)
+        alpha = max(alpha, value)
+        if alpha >= beta:
+            break  # 剪枝
+    
+    if best_value <= alpha_orig:
+        flag = TT_UPPER
+    elif best_value >= beta:
+        flag = TT_LOWER
+    else:
+        flag = TT_EXACT
+    transposition_table[board_hash] = (depth, best_value, flag, best_move)
+    return best_value
 
-        # 加入微小的随机因子，避免AI每次走法完全一致
-        score += random.randint(0, 5)
+def _transform_bb(bb, t):
+    """对位棋盘施加对称变换 t"""
+    table = SYMMETRIES[t]
+    result = 0
+    while bb:
+        low = bb & -bb
+        result |= 1 << table[low.bit_length() - 1]
+        bb ^= low
+    return result
 
-        if score > best_score:
-            best_score = score
-            best_move = (row, col)
-            
-    return best_move
+def _transform_cell(cell, t):
+    """对格子 (row, col) 施加对称变换 t"""
+    return divmod(SYMMETRIES[t][cell[0] * BOARD_SIZE + cell[1]], BOARD_SIZE)
+
+def board_symmetries():
+    """返回使当前局面保持不变的对称变换编号列表（总包含恒等变换 0）"""
+    group = [0]
+    for t in range(1, len(SYMMETRIES)):
+        if _transform_bb(black_bb, t) == black_bb and _transform_bb(white_bb, t) == white_bb:
+            group.append(t)
+    return group
+
+def get_ai_move():
+    """AI获取最佳落子位置（迭代加深的 α-β 搜索）"""
+    candidates = get_candidate_positions()
+    if not candidates:
+        return None
+    
+    # 开局阶段棋盘常常是对称的，互相对称的落子只需搜索其中一个
+    group = board_symmetries()
+    allowed = None
+    if len(group) > 1:
+        allowed = {min(_transform_cell(move, t) for t in group) for move in candidates}
+    
+    start = time.perf_counter()
+    for depth in range(AI_MIN_DEPTH, AI_MAX_DEPTH + 1):
+        negamax(depth, -WIN_SCORE * 2, WIN_SCORE * 2, WHITE, allowed)
+        # 超时则不再开始更深一层的搜索
+        if time.perf_counter() - start > AI_TIME_LIMIT:
+            break
+    
+    best_move = transposition_table[board_hash][3]
+    # 从等价的对称落子中随机选一个，保持开局的多样性
+    return _transform_cell(best_move, group[np.random.randint(len(group))])
 
 # ==================== 游戏控制函数 ====================
 def switch_player():
@@ -318,6 +607,32 @@ def print_message(msg):
     """打印消息"""
     print(f"\n  >> {msg}")
 
+def wait_for_ai_move():
+    """在后台线程中计算 AI 落子，等待期间刷新思考动画，返回 (row, col)"""
+    global thinking
+    result = queue.Queue(maxsize=1)
+    worker = threading.Thread(target=lambda: result.put(get_ai_move()), daemon=True)
+    
+    thinking = True
+    start = time.perf_counter()
+    worker.start()
+    
+    sys.stdout.write("\n")
+    frame = 0
+    # AI 算得太快时补足最短思考时间，模拟真实感
+    while worker.is_alive() or time.perf_counter() - start < MIN_AI_THINK:
+        sys.stdout.write(f"\r  >> AI 正在思考 {SPINNER[frame % len(SPINNER)]}")
+        sys.stdout.flush()
+        frame += 1
+        if worker.is_alive():
+            worker.join(SPINNER_INTERVAL)
+        else:
+            time.sleep(SPINNER_INTERVAL)
+    sys.stdout.write("\n")
+    thinking = False
+    
+    return result.get_nowait()
+
 def game_loop():
     """主游戏循环"""
     global game_over
@@ -334,10 +649,7 @@ def game_loop():
         
         if ai_enabled and current_player == WHITE and not game_over:
             # AI回合
-            print_message("AI 正在思考...")
-            time.sleep(0.5)  # 增加一点思考时间，模拟真实感
-            
-            row, col = get_ai_move()
+            row, col = wait_for_ai_move()
             if make_move(row, col, WHITE):
                 game_over = True
             else:
@@ -401,14 +713,12 @@ def game_loop():
 def show_menu():
     """显示主菜单"""
     clear_screen()
-    print("\n" + "=" * 60)
-    print("          ASCII字符五子棋 - 人机对战 v2.0")
-    print("=" * 60)
+    print(_TITLE, end="")
     print("\n  选择游戏模式:")
     print("  1. 人机对战 (玩家执黑先行)")
     print("  2. 双人本地对战")
     print("  3. 退出游戏")
-    print("\n" + "-" * 60)
+    print("\n" + _RULE)
     
     while True:
         choice = input("\n  请输入选项 (1-3): ").strip()